@@ -79,6 +79,14 @@ def train(config: DictConfig) -> nn.DataParallel:
     device = check_envirionment(config.train.use_cuda)
     if hasattr(config.train, "num_threads") and int(config.train.num_threads) > 0:
         torch.set_num_threads(config.train.num_threads)
+
+    # launched through torchrun: one process per GPU, wrapped in DDP below
+    distributed = int(os.environ.get('WORLD_SIZE', '1')) > 1
+    if distributed:
+        torch.distributed.init_process_group(backend='nccl')
+        local_rank = int(os.environ['LOCAL_RANK'])
+        torch.cuda.set_device(local_rank)
+        device = torch.device('cuda', local_rank)
   
     vocab = KsponSpeechVocabulary(
         f'../../../data/vocab/aihub_{config.train.output_unit}_vocabs.csv',
@@ -89,6 +97,10 @@ def train(config: DictConfig) -> nn.DataParallel:
         epoch_time_step, trainset_list, validset = split_dataset(config, config.train.transcripts_path, vocab)
         model = build_model(config, vocab, device)
 
+        if distributed:
+            # build_model wraps in nn.DataParallel; DDP takes the bare module per rank
+            model = nn.parallel.DistributedDataParallel(model.module.to(device), device_ids=[local_rank])
+
         optimizer = get_optimizer(model, config)
         lr_scheduler = get_lr_scheduler(config, optimizer, epoch_time_step)
 
@@ -118,6 +130,7 @@ def train(config: DictConfig) -> nn.DataParallel:
         architecture=config.model.architecture,
         vocab=vocab,
         joint_ctc_attention=config.model.joint_ctc_attention,
+        mixed_precision=config.train.mixed_precision,
     )
     model = trainer.train(
         model=model,
@@ -160,7 +173,17 @@ def main(config: DictConfig) -> None:
     warnings.filterwarnings('ignore')
     logger.info(OmegaConf.to_yaml(config))
     last_model_checkpoint = train(config)
-    torch.save(last_model_checkpoint, os.path.join(os.getcwd(), "last_model_checkpoint.pt"))
+    if int(os.environ.get('RANK', '0')) == 0:
+        if isinstance(last_model_checkpoint, (nn.DataParallel, nn.parallel.DistributedDataParallel)):
+            last_model_checkpoint = last_model_checkpoint.module
+
+        # half-precision state_dict + pickle protocol 5 halves the final artifact's size
+        # and write time; restore with load_state_dict(...) followed by model.float()
+        state_dict = {
+            key: value.half().cpu() if value.is_floating_point() else value.cpu()
+            for key, value in last_model_checkpoint.state_dict().items()
+        }
+        torch.save(state_dict, os.path.join(os.getcwd(), "last_model_checkpoint.pt"), pickle_protocol=5)
 
 
 if __name__ == '__main__':
@@ -77,7 +77,12 @@ class Checkpoint(object):
             'epoch': self.epoch,
         }
         torch.save(trainer_states, os.path.join(os.getcwd(), self.TRAINER_STATE_NAME))
-        torch.save(self.model, os.path.join(os.getcwd(), self.MODEL_NAME))
+
+        model = self.model
+        if isinstance(model, nn.parallel.DistributedDataParallel):
+            # the DDP wrapper holds a process-group handle, which cannot be pickled
+            model = model.module
+        torch.save(model, os.path.join(os.getcwd(), self.MODEL_NAME))
         logger.info('save checkpoints\n%s\n%s'
                     % (os.path.join(os.getcwd(), f'{date_time}-{self.TRAINER_STATE_NAME}'),
                        os.path.join(os.getcwd(), f'{date_time}-{self.MODEL_NAME}')))
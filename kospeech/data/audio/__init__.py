@@ -28,6 +28,7 @@ class AudioConfig:
     freq_mask_num: int = 2
     spec_augment: bool = True
     input_reverse: bool = False
+    cache_features: bool = False
 
 
 @dataclass
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import numpy as np
 
 from kospeech.utils import logger
@@ -67,6 +68,7 @@ class SpectrogramParser(AudioParser):
         sos_id (int): start of sentence token`s identification
         eos_id (int): end of sentence token`s identification
         dataset_path (str): noise dataset path
+        cache_features (bool): flag indication whether to cache extracted features on disk (default: False)
     """
     VANILLA = 0           # Not apply augmentation
     SPEC_AUGMENT = 1      # SpecAugment
@@ -89,6 +91,7 @@ class SpectrogramParser(AudioParser):
             eos_id: int = 2,                          # end of sentence token`s identification
             dataset_path: str = None,                 # noise dataset path
             audio_extension: str = 'pcm',             # audio extension
+            cache_features: bool = False,             # flag indication whether to cache features on disk
     ) -> None:
         super(SpectrogramParser, self).__init__(dataset_path)
         self.del_silence = del_silence
@@ -98,6 +101,7 @@ class SpectrogramParser(AudioParser):
         self.eos_id = eos_id
         self.spec_augment = SpecAugment(freq_mask_para, time_mask_num, freq_mask_num)
         self.audio_extension = audio_extension
+        self.cache_features = cache_features
 
         if transform_method.lower() == 'mel':
             self.transforms = MelSpectrogram(sample_rate, n_mels, frame_length, frame_shift, feature_extract_by)
@@ -121,13 +125,19 @@ class SpectrogramParser(AudioParser):
         Returns: feature_vector
             - **feature_vector** (torch.FloatTensor): feature from audio file.
         """
-        signal = load_audio(audio_path, self.del_silence, extension=self.audio_extension)
+        feature = self._load_cached_feature(audio_path) if self.cache_features else None
 
-        if signal is None:
-            logger.info("Audio is None : {0}".format(audio_path))
-            return None
+        if feature is None:
+            signal = load_audio(audio_path, self.del_silence, extension=self.audio_extension)
+
+            if signal is None:
+                logger.info("Audio is None : {0}".format(audio_path))
+                return None
+
+            feature = self.transforms(signal)
 
-        feature = self.transforms(signal)
+            if self.cache_features:
+                self._save_cached_feature(audio_path, feature)
 
         if self.normalize:
             feature -= feature.mean()
@@ -145,5 +155,37 @@ class SpectrogramParser(AudioParser):
 
         return feature
 
+    def _load_cached_feature(self, audio_path: str):
+        """
+        Loads a pre-extracted feature from disk. Cached features are stored next to the audio file
+        as float16 `.npy` arrays, so repeated epochs skip the STFT / mel-spectrogram computation and
+        become I/O bound. Delete the `.npy` files when the audio configuration changes.
+        """
+        cache_path = audio_path + '.npy'
+
+        if not os.path.isfile(cache_path):
+            return None
+
+        try:
+            return np.load(cache_path).astype(np.float32)
+        except (IOError, ValueError):
+            logger.info("Invalid feature cache : {0}".format(cache_path))
+            return None
+
+    def _save_cached_feature(self, audio_path: str, feature) -> None:
+        """ Saves an extracted feature next to the audio file as a float16 `.npy` array """
+        cache_path = audio_path + '.npy'
+        tmp_path = '{0}.{1}.tmp'.format(cache_path, os.getpid())
+
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.asarray(feature).astype(np.float16))
+            # the clean & augmented copies of one utterance can be cached by different
+            # workers at the same time; os.replace lets the last writer win atomically
+            # instead of interleaving into a corrupt file
+            os.replace(tmp_path, cache_path)
+        except IOError:
+            logger.info("Failed to cache feature : {0}".format(audio_path))
+
     def parse_transcript(self, *args, **kwargs):
         raise NotImplementedError
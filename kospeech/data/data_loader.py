@@ -57,7 +57,7 @@ class SpectrogramDataset(Dataset, SpectrogramParser):
             normalize=config.audio.normalize, freq_mask_para=config.audio.freq_mask_para,
             time_mask_num=config.audio.time_mask_num, freq_mask_num=config.audio.freq_mask_num,
             sos_id=sos_id, eos_id=eos_id, dataset_path=dataset_path, transform_method=config.audio.transform_method,
-            audio_extension=audio_extension
+            audio_extension=audio_extension, cache_features=config.audio.cache_features
         )
         self.audio_paths = list(audio_paths)
         self.transcripts = list(transcripts)
@@ -69,14 +69,17 @@ class SpectrogramDataset(Dataset, SpectrogramParser):
     def get_item(self, idx):
         """ get feature vector & transcript """
         feature = self.parse_audio(os.path.join(self.dataset_path, self.audio_paths[idx]), self.augment_methods[idx])
-        
+
         if feature is None:
             return None, None
-        
+
         transcript = self.parse_transcript(self.transcripts[idx])
 
         return feature, transcript
 
+    def __getitem__(self, idx):
+        return self.get_item(idx)
+
     def parse_transcript(self, transcript):
         """ Parses transcript """
         tokens = transcript.split(' ')
@@ -182,6 +185,12 @@ def _collate_fn(batch, pad_id):
     def target_length_(p):
         return len(p[1])
 
+    # audio that failed to parse is returned as (None, None) & excluded from the batch
+    batch = [sample for sample in batch if sample[0] is not None]
+
+    if len(batch) == 0:
+        return torch.zeros(0, 0, 0), torch.zeros(0, 0).to(torch.long), torch.IntTensor([]), list()
+
     # sort by sequence length for rnn.pack_padded_sequence()
     batch = sorted(batch, key=lambda sample: sample[0].size(0), reverse=True)
 
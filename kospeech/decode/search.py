@@ -63,9 +63,9 @@ class GreedySearch(object):
 
             y_hats = model.recognize(inputs, input_lengths)
 
-            for idx in range(targets.size(0)):
-                self.target_list.append(self.vocab.label_to_string(targets[idx]))
-                self.predict_list.append(self.vocab.label_to_string(y_hats[idx].cpu().detach().numpy()))
+            # decode the whole batch at once instead of sample by sample
+            self.target_list.extend(self.vocab.label_to_string(targets))
+            self.predict_list.extend(self.vocab.label_to_string(y_hats))
 
             cer = self.metric(targets[:, 1:], y_hats)
             total_sent_num += targets.size(0)
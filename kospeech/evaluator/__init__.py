@@ -27,4 +27,6 @@ class EvalConfig:
     print_every: int = 20
     decode: str = 'greedy'
     k: int = 3
-    use_cuda: bool = True
\ No newline at end of file
+    use_cuda: bool = True
+    use_jit: bool = False
+    use_cuda_graph: bool = False
\ No newline at end of file
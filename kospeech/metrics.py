@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import Levenshtein as Lev
+from rapidfuzz.distance import Levenshtein as Lev
 
 
 class ErrorRate(object):
@@ -50,10 +50,11 @@ class ErrorRate(object):
         total_dist = 0
         total_length = 0
 
-        for (target, y_hat) in zip(targets, y_hats):
-            s1 = self.vocab.label_to_string(target)
-            s2 = self.vocab.label_to_string(y_hat)
+        # decode the whole batch at once so the per-token work is vectorized inside the vocabulary
+        target_sentences = self.vocab.label_to_string(targets)
+        y_hat_sentences = self.vocab.label_to_string(y_hats)
 
+        for (s1, s2) in zip(target_sentences, y_hat_sentences):
             dist, length = self.metric(s1, s2)
 
             total_dist += dist
@@ -70,6 +71,8 @@ class CharacterErrorRate(ErrorRate):
     Computes the Character Error Rate, defined as the edit distance between the
     two provided sentences after tokenizing to characters.
     """
+    STRIP_TABLE = str.maketrans('', '', ' _')
+
     def __init__(self, vocab):
         super(CharacterErrorRate, self).__init__(vocab)
 
@@ -82,18 +85,12 @@ class CharacterErrorRate(ErrorRate):
             s1 (string): space-separated sentence
             s2 (string): space-separated sentence
         """
-        s1 = s1.replace(' ', '')
-        s2 = s2.replace(' ', '')
-
-        # if '_' in sentence, means subword-unit, delete '_'
-        if '_' in s1:
-            s1 = s1.replace('_', '')
-
-        if '_' in s2:
-            s2 = s2.replace('_', '')
+        # strip spaces & subword-unit markers ('_') in a single pass
+        s1 = s1.translate(self.STRIP_TABLE)
+        s2 = s2.translate(self.STRIP_TABLE)
 
         dist = Lev.distance(s2, s1)
-        length = len(s1.replace(' ', ''))
+        length = len(s1)
 
         return dist, length
 
@@ -120,8 +117,8 @@ class WordErrorRate(ErrorRate):
         b = set(s1.split() + s2.split())
         word2char = dict(zip(b, range(len(b))))
 
-        # map the words to a char array (Levenshtein packages only accepts
-        # strings)
+        # map the words to a char array (the Levenshtein implementation only
+        # accepts strings)
         w1 = [chr(word2char[w]) for w in s1.split()]
         w2 = [chr(word2char[w]) for w in s2.split()]
 
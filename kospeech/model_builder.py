@@ -18,6 +18,7 @@ from omegaconf import DictConfig
 from astropy.modeling import ParameterError
 
 from kospeech.models.conformer import Conformer
+from kospeech.utils import logger
 from kospeech.vocabs import Vocabulary
 from kospeech.models.las import EncoderRNN
 from kospeech.decode.ensemble import (
@@ -132,6 +133,16 @@ def build_model(
     else:
         raise ValueError('Unsupported model: {0}'.format(config.model.architecture))
 
+    if getattr(config.train, 'torch_compile', False):
+        if hasattr(torch, 'compile'):
+            # compile the inner module and keep the DataParallel wrapper outermost,
+            # so the trainer's isinstance checks & .module accesses keep working.
+            # dynamic=True avoids recompiling for every new sequence length.
+            torch._dynamo.config.cache_size_limit = 64
+            model.module = torch.compile(model.module, dynamic=True)
+        else:
+            logger.warning("torch.compile requires torch >= 2.0, running eager instead")
+
     print(model)
 
     return model
@@ -349,6 +360,25 @@ def build_jasper(
     ))
 
 
+class _ScriptedRecognizer(nn.Module):
+    """
+    Scripting wrapper for evaluation. `torch.jit.script` only compiles `forward` and the
+    methods reachable from it, while the evaluator drives models through `recognize`;
+    routing `forward` through `recognize` (and exporting `recognize` itself) makes the
+    decoding loop the compiled entry point.
+    """
+    def __init__(self, model: nn.Module) -> None:
+        super(_ScriptedRecognizer, self).__init__()
+        self.model = model
+
+    def forward(self, inputs: torch.Tensor, input_lengths: torch.Tensor) -> torch.Tensor:
+        return self.model.recognize(inputs, input_lengths)
+
+    @torch.jit.export
+    def recognize(self, inputs: torch.Tensor, input_lengths: torch.Tensor) -> torch.Tensor:
+        return self.model.recognize(inputs, input_lengths)
+
+
 def load_test_model(config: DictConfig, device: torch.device):
     model = torch.load(config.model_path, map_location=lambda storage, loc: storage).to(device)
 
@@ -360,6 +390,22 @@ def load_test_model(config: DictConfig, device: torch.device):
         model.encoder.device = device
         model.decoder.device = device
 
+    if getattr(config, 'use_cuda_graph', False):
+        decoder = model.module.decoder if isinstance(model, nn.DataParallel) else model.decoder
+        if hasattr(decoder, 'use_cuda_graph'):
+            decoder.use_cuda_graph = True
+        else:
+            logger.warning("CUDA Graph decoding is only supported by DecoderRNN, ignoring use_cuda_graph")
+
+    if getattr(config, 'use_jit', False):
+        if isinstance(model, nn.DataParallel):
+            model = model.module
+        model.eval()
+        try:
+            model = torch.jit.script(_ScriptedRecognizer(model))
+        except Exception as e:
+            logger.warning("TorchScript compile failed, falling back to eager execution: {0}".format(e))
+
     return model
 
 
@@ -47,8 +47,25 @@ class AdditiveAttention(nn.Module):
         self.score_proj = Linear(dim, 1)
         self.bias = nn.Parameter(torch.rand(dim).uniform_(-0.1, 0.1))
 
-    def forward(self, query: Tensor, key: Tensor, value: Tensor) -> Tuple[Tensor, Tensor]:
-        score = self.score_proj(torch.tanh(self.key_proj(key) + self.query_proj(query) + self.bias)).squeeze(-1)
+    def precompute_keys(self, key: Tensor) -> Tensor:
+        """
+        Project the keys once. The key projection only depends on the encoder outputs,
+        so the result can be passed to forward() via `cached_keys` and reused at every
+        decoding step instead of being recomputed.
+        """
+        return self.key_proj(key)
+
+    def forward(
+            self,
+            query: Tensor,
+            key: Tensor,
+            value: Tensor,
+            cached_keys: Optional[Tensor] = None,
+    ) -> Tuple[Tensor, Tensor]:
+        if cached_keys is None:
+            cached_keys = self.precompute_keys(key)
+
+        score = self.score_proj(torch.tanh(cached_keys + self.query_proj(query) + self.bias)).squeeze(-1)
         attn = F.softmax(score, dim=-1)
         context = torch.bmm(attn.unsqueeze(1), value)
 
@@ -72,6 +89,9 @@ class ScaledDotProductAttention(nn.Module):
         - **key** (batch, k_len, d_model): tensor containing projection vector for encoder.
         - **value** (batch, v_len, d_model): tensor containing features of the encoded input sequence.
         - **mask** (-): tensor containing indices to be masked
+        - **need_weights** (bool): whether the caller consumes the attention weights. When `False`,
+          the fused `F.scaled_dot_product_attention` kernel is used if available and `attn` is
+          returned as `None`.
 
     Returns: context, attn
         - **context**: tensor containing the context vector from attention mechanism.
@@ -90,7 +110,20 @@ class ScaledDotProductAttention(nn.Module):
             key: Tensor,
             value: Tensor,
             mask: Optional[Tensor] = None,
-    ) -> Tuple[Tensor, Tensor]:
+            need_weights: bool = True,
+    ) -> Tuple[Tensor, Optional[Tensor]]:
+        if (
+                not need_weights
+                and hasattr(F, 'scaled_dot_product_attention')
+                and self.sqrt_dim == math.sqrt(query.size(-1))
+        ):
+            # the fused kernel applies the 1/sqrt(d) scaling itself and never materializes
+            # the full score matrix; kospeech masks flag positions to drop while the kernel
+            # expects positions to keep, hence the inversion
+            attn_mask = None if mask is None else ~mask
+            context = F.scaled_dot_product_attention(query, key, value, attn_mask=attn_mask)
+            return context, None
+
         score = torch.bmm(query, key.transpose(1, 2)) / self.sqrt_dim
 
         if mask is not None:
@@ -139,27 +172,45 @@ class MultiHeadAttention(nn.Module):
         self.value_proj = Linear(dim, self.d_head * num_heads)
         self.scaled_dot_attn = ScaledDotProductAttention(self.d_head, scale=True)
 
+    def precompute_kv(self, key: Tensor, value: Tensor) -> Tuple[Tensor, Tensor]:
+        """
+        Project & reshape key/value once. When the same key/value (e.g. encoder outputs) are attended
+        at every decoding step, the returned pair can be passed to forward() via `cached_kv`
+        so the linear projections are not recomputed step by step.
+        """
+        batch_size = value.size(0)
+
+        key = self.key_proj(key).view(batch_size, -1, self.num_heads, self.d_head)
+        value = self.value_proj(value).view(batch_size, -1, self.num_heads, self.d_head)
+
+        key = key.permute(2, 0, 1, 3).contiguous().view(batch_size * self.num_heads, -1, self.d_head)
+        value = value.permute(2, 0, 1, 3).contiguous().view(batch_size * self.num_heads, -1, self.d_head)
+
+        return key, value
+
     def forward(
             self,
             query: Tensor,
             key: Tensor,
             value: Tensor,
             mask: Optional[Tensor] = None,
-    ) -> Tuple[Tensor, Tensor]:
+            cached_kv: Optional[Tuple[Tensor, Tensor]] = None,
+            need_weights: bool = True,
+    ) -> Tuple[Tensor, Optional[Tensor]]:
         batch_size = value.size(0)
 
         query = self.query_proj(query).view(batch_size, -1, self.num_heads, self.d_head)
-        key = self.key_proj(key).view(batch_size, -1, self.num_heads, self.d_head)
-        value = self.value_proj(value).view(batch_size, -1, self.num_heads, self.d_head)
-
         query = query.permute(2, 0, 1, 3).contiguous().view(batch_size * self.num_heads, -1, self.d_head)
-        key = key.permute(2, 0, 1, 3).contiguous().view(batch_size * self.num_heads, -1, self.d_head)
-        value = value.permute(2, 0, 1, 3).contiguous().view(batch_size * self.num_heads, -1, self.d_head)
+
+        if cached_kv is None:
+            key, value = self.precompute_kv(key, value)
+        else:
+            key, value = cached_kv
 
         if mask is not None:
             mask = mask.repeat(self.num_heads, 1, 1)
 
-        context, attn = self.scaled_dot_attn(query, key, value, mask)
+        context, attn = self.scaled_dot_attn(query, key, value, mask, need_weights=need_weights)
 
         context = context.view(self.num_heads, batch_size, -1, self.d_head)
         context = context.permute(1, 2, 0, 3).contiguous().view(batch_size, -1, self.num_heads * self.d_head)
@@ -292,9 +343,26 @@ class LocationAwareAttention(nn.Module):
         self.fc = Linear(attn_dim, 1, bias=True)
         self.smoothing = smoothing
 
-    def forward(self, query: Tensor, value: Tensor, last_alignment_energy: Tensor) -> Tuple[Tensor, Tensor]:
+    def precompute_values(self, value: Tensor) -> Tensor:
+        """
+        Project the values once. The value projection only depends on the encoder outputs,
+        so the result can be passed to forward() via `cached_values` and reused at every
+        decoding step instead of being recomputed.
+        """
+        return self.value_proj(value)
+
+    def forward(
+            self,
+            query: Tensor,
+            value: Tensor,
+            last_alignment_energy: Tensor,
+            cached_values: Optional[Tensor] = None,
+    ) -> Tuple[Tensor, Tensor]:
         batch_size, hidden_dim, seq_length = query.size(0), query.size(2), value.size(1)
 
+        if cached_values is None:
+            cached_values = self.precompute_values(value)
+
         if last_alignment_energy is None:
             last_alignment_energy = value.new_zeros(batch_size, seq_length)
 
@@ -303,7 +371,7 @@ class LocationAwareAttention(nn.Module):
 
         alignmment_energy = self.fc(torch.tanh(
                 self.query_proj(query)
-                + self.value_proj(value)
+                + cached_values
                 + last_alignment_energy
                 + self.bias
         )).squeeze(dim=-1)
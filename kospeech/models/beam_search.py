@@ -17,7 +17,6 @@ import torch.nn as nn
 from torch import Tensor
 
 from kospeech.models import DecoderRNN
-from kospeech.models.decoder import BaseDecoder
 from kospeech.models.transformer.decoder import TransformerDecoder
 
 
@@ -107,6 +106,25 @@ class BeamSearchBaseDecoder(nn.Module):
 
         return True
 
+    def _is_search_finished(self) -> bool:
+        """
+        Checks whether the top candidate of every batch element can no longer be beaten.
+        Cumulative log-probabilities only decrease as decoding proceeds, so once each batch element
+        has a finished hypothesis scoring at least as high as its best ongoing beam,
+        further decoding steps cannot change the result.
+        """
+        cumulative_ps = self.cumulative_ps.view(-1, self.beam_size)
+
+        for batch_idx in range(cumulative_ps.size(0)):
+            if len(self.finished[batch_idx]) == 0:
+                return False
+
+            best_finished_p = max(self.finished_ps[batch_idx])
+            if float(best_finished_p) < float(cumulative_ps[batch_idx].max()):
+                return False
+
+        return True
+
     def _fill_sequence(self, y_hats: list) -> Tensor:
         batch_size = len(y_hats)
         max_length = -1
@@ -127,24 +145,15 @@ class BeamSearchBaseDecoder(nn.Module):
         raise NotImplementedError
 
 
-class BeamDecoderRNN(BaseDecoder):
+class BeamDecoderRNN(BeamSearchBaseDecoder):
     """ Beam Search Decoder RNN """
     def __init__(self, decoder: DecoderRNN, beam_size: int, batch_size: int):
-        super(BeamDecoderRNN, self).__init__()
-        self.decoder = decoder
-        self.beam_size = beam_size
+        super(BeamDecoderRNN, self).__init__(decoder, beam_size, batch_size)
         self.batch_size = batch_size
         self.hidden_state_dim = decoder.hidden_state_dim
-        self.pad_id = decoder.pad_id
-        self.eos_id = decoder.eos_id
         self.device = decoder.device
         self.num_layers = decoder.num_layers
-        self.ongoing_beams = None
-        self.cumulative_ps = None
-        self.finished = [[] for _ in range(batch_size)]
-        self.finished_ps = [[] for _ in range(batch_size)]
         self.validate_args = decoder.validate_args
-        self.forward_step = decoder.forward_step
 
     def forward(self, encoder_outputs: Tensor) -> list:
         return self.decoder.forward(targets=None, encoder_outputs=encoder_outputs, teacher_forcing_ratio=0.0)
@@ -164,11 +173,13 @@ class BeamDecoderRNN(BaseDecoder):
         input_var = self.ongoing_beams
 
         encoder_dim = encoder_outputs.size(2)
-        encoder_outputs = self._inflate(encoder_outputs, self.beam_size, dim=0)
-        encoder_outputs = encoder_outputs.view(self.beam_size, batch_size, -1, encoder_dim)
-        encoder_outputs = encoder_outputs.transpose(0, 1)
+        encoder_outputs = encoder_outputs.unsqueeze(1).expand(-1, self.beam_size, -1, -1)
         encoder_outputs = encoder_outputs.reshape(batch_size * self.beam_size, -1, encoder_dim)
-        
+
+        # attention K/V projections are constant across steps; project the inflated
+        # encoder outputs once so every beam step runs a single (B x K) batched call
+        cached_kv = self.decoder.precompute_attention_kv(encoder_outputs)
+
         if attn is not None:
             attn = self._inflate(attn, self.beam_size, dim=0)
         
@@ -178,11 +189,13 @@ class BeamDecoderRNN(BaseDecoder):
             hidden_states = self._inflate(hidden_states, self.beam_size, 1)
 
         for di in range(max_length - 1):
-            if self._is_all_finished(self.beam_size):
+            if self._is_all_finished(self.beam_size) or self._is_search_finished():
                 break
 
             hidden_states = hidden_states.view(self.num_layers, batch_size * self.beam_size, self.hidden_state_dim)
-            step_outputs, hidden_states, attn = self.forward_step(input_var, hidden_states, encoder_outputs, attn)
+            step_outputs, hidden_states, attn = self.forward_step(
+                input_var, hidden_states, encoder_outputs, attn, cached_kv,
+            )
 
             step_outputs = step_outputs.view(batch_size, self.beam_size, -1)
             current_ps, current_vs = step_outputs.topk(self.beam_size)
@@ -200,13 +213,11 @@ class BeamDecoderRNN(BaseDecoder):
             topk_current_ps, topk_status_ids = current_ps.topk(self.beam_size)
             prev_status_ids = (topk_status_ids // self.beam_size)
 
-            topk_current_vs = torch.zeros((batch_size, self.beam_size), dtype=torch.long)
-            prev_status = torch.zeros(self.ongoing_beams.size(), dtype=torch.long)
-
-            for batch_idx, batch in enumerate(topk_status_ids):
-                for idx, topk_status_idx in enumerate(batch):
-                    topk_current_vs[batch_idx, idx] = current_vs[batch_idx, topk_status_idx]
-                    prev_status[batch_idx, idx] = self.ongoing_beams[batch_idx, prev_status_ids[batch_idx, idx]]
+            # gather the successor tokens & parent beams in one call instead of a per-hypothesis loop
+            topk_current_vs = current_vs.gather(1, topk_status_ids)
+            prev_status = self.ongoing_beams.gather(
+                1, prev_status_ids.unsqueeze(2).expand(-1, -1, self.ongoing_beams.size(2))
+            )
 
             self.ongoing_beams = torch.cat([prev_status, topk_current_vs.unsqueeze(2)], dim=2).to(self.device)
             self.cumulative_ps = topk_current_ps.to(self.device)
@@ -267,15 +278,13 @@ class BeamTransformerDecoder(BeamSearchBaseDecoder):
         decoder_inputs = torch.cat((decoder_inputs, self.ongoing_beams), dim=-1)  # bsz * beam x 2
 
         encoder_dim = encoder_outputs.size(2)
-        encoder_outputs = self._inflate(encoder_outputs, self.beam_size, dim=0)
-        encoder_outputs = encoder_outputs.view(self.beam_size, batch_size, -1, encoder_dim)
-        encoder_outputs = encoder_outputs.transpose(0, 1)
+        encoder_outputs = encoder_outputs.unsqueeze(1).expand(-1, self.beam_size, -1, -1)
         encoder_outputs = encoder_outputs.reshape(batch_size * self.beam_size, -1, encoder_dim)
 
         encoder_output_lengths = encoder_output_lengths.unsqueeze(1).repeat(1, self.beam_size).view(-1)
 
         for di in range(2, self.decoder.max_length):
-            if self._is_all_finished(self.beam_size):
+            if self._is_all_finished(self.beam_size) or self._is_search_finished():
                 break
 
             decoder_input_lengths = torch.LongTensor(batch_size * self.beam_size).fill_(di)
@@ -309,13 +318,11 @@ class BeamTransformerDecoder(BeamSearchBaseDecoder):
             topk_current_ps, topk_status_ids = current_ps.topk(self.beam_size)
             prev_status_ids = (topk_status_ids // self.beam_size)
 
-            topk_current_vs = torch.zeros((batch_size, self.beam_size), dtype=torch.long)
-            prev_status = torch.zeros(self.ongoing_beams.size(), dtype=torch.long)
-
-            for batch_idx, batch in enumerate(topk_status_ids):
-                for idx, topk_status_idx in enumerate(batch):
-                    topk_current_vs[batch_idx, idx] = current_vs[batch_idx, topk_status_idx]
-                    prev_status[batch_idx, idx] = self.ongoing_beams[batch_idx, prev_status_ids[batch_idx, idx]]
+            # gather the successor tokens & parent beams in one call instead of a per-hypothesis loop
+            topk_current_vs = current_vs.gather(1, topk_status_ids)
+            prev_status = self.ongoing_beams.gather(
+                1, prev_status_ids.unsqueeze(2).expand(-1, -1, self.ongoing_beams.size(2))
+            )
 
             self.ongoing_beams = torch.cat([prev_status, topk_current_vs.unsqueeze(2)], dim=2)
             self.cumulative_ps = topk_current_ps
@@ -15,11 +15,11 @@
 import random
 import torch
 import torch.nn as nn
-from torch import Tensor, LongTensor
+from torch import Tensor
 from typing import Optional, Any, Tuple
 
 from kospeech.models.decoder import BaseDecoder
-from kospeech.models.modules import Linear, View
+from kospeech.models.modules import Linear
 from kospeech.models.attention import (
     LocationAwareAttention,
     MultiHeadAttention,
@@ -86,6 +86,7 @@ class DecoderRNN(BaseDecoder):
         self.eos_id = eos_id
         self.sos_id = sos_id
         self.pad_id = pad_id
+        self.use_cuda_graph = False
         self.attn_mechanism = attn_mechanism.lower()
         self.embedding = nn.Embedding(num_classes, hidden_state_dim)
         self.input_dropout = nn.Dropout(dropout_p)
@@ -114,7 +115,6 @@ class DecoderRNN(BaseDecoder):
         self.fc = nn.Sequential(
             Linear(hidden_state_dim << 1, hidden_state_dim),
             nn.Tanh(),
-            View(shape=(-1, self.hidden_state_dim), contiguous=True),
             Linear(hidden_state_dim, num_classes),
         )
 
@@ -124,9 +124,8 @@ class DecoderRNN(BaseDecoder):
             hidden_states: Optional[Tensor],
             encoder_outputs: Tensor,
             attn: Optional[Tensor] = None,
+            cached_kv: Optional[Tuple[Tensor, Tensor]] = None,
     ) -> Tuple[Tensor, Tensor, Tensor]:
-        batch_size, output_lengths = input_var.size(0), input_var.size(1)
-
         embedded = self.embedding(input_var)
         embedded = self.input_dropout(embedded)
 
@@ -136,17 +135,38 @@ class DecoderRNN(BaseDecoder):
         outputs, hidden_states = self.rnn(embedded, hidden_states)
 
         if self.attn_mechanism == 'loc':
-            context, attn = self.attention(outputs, encoder_outputs, attn)
+            context, attn = self.attention(outputs, encoder_outputs, attn, cached_values=cached_kv)
+        elif self.attn_mechanism == 'additive':
+            context, attn = self.attention(outputs, encoder_outputs, encoder_outputs, cached_keys=cached_kv)
+        elif cached_kv is not None:
+            context, attn = self.attention(
+                outputs, encoder_outputs, encoder_outputs, cached_kv=cached_kv, need_weights=False,
+            )
         else:
-            context, attn = self.attention(outputs, encoder_outputs, encoder_outputs)
+            context, attn = self.attention(outputs, encoder_outputs, encoder_outputs, need_weights=False)
 
         outputs = torch.cat((outputs, context), dim=2)
 
-        step_outputs = self.fc(outputs.view(-1, self.hidden_state_dim << 1)).log_softmax(dim=-1)
-        step_outputs = step_outputs.view(batch_size, output_lengths, -1).squeeze(1)
+        # Linear broadcasts over the leading dims, so no flatten/unflatten round-trip is needed
+        step_outputs = self.fc(outputs).log_softmax(dim=-1)
+        step_outputs = step_outputs.squeeze(1)
 
         return step_outputs, hidden_states, attn
 
+    def precompute_attention_kv(self, encoder_outputs: Tensor) -> Optional[Tuple[Tensor, Tensor]]:
+        """
+        Pre-project encoder outputs for the attention mechanism. The projections are constant across
+        autoregressive decoding steps, so they are computed once per utterance and reused in
+        every `forward_step` call instead of being recomputed step by step.
+        """
+        if self.attn_mechanism == 'multi-head':
+            return self.attention.precompute_kv(encoder_outputs, encoder_outputs)
+        if self.attn_mechanism == 'additive':
+            return self.attention.precompute_keys(encoder_outputs)
+        if self.attn_mechanism == 'loc':
+            return self.attention.precompute_values(encoder_outputs)
+        return None
+
     def forward(
             self,
             targets: Optional[Tensor],
@@ -166,7 +186,6 @@ class DecoderRNN(BaseDecoder):
             * predicted_log_probs (torch.FloatTensor): Log probability of model predictions.
         """
         hidden_states, attn = None, None
-        predicted_log_probs = list()
 
         targets, batch_size, max_length = self.validate_args(targets, encoder_outputs, teacher_forcing_ratio)
         use_teacher_forcing = True if random.random() < teacher_forcing_ratio else False
@@ -175,6 +194,9 @@ class DecoderRNN(BaseDecoder):
             targets = targets[targets != self.eos_id].view(batch_size, -1)
 
             if self.attn_mechanism == 'loc' or self.attn_mechanism == 'additive':
+                cached_kv = self.precompute_attention_kv(encoder_outputs)
+                predicted_log_probs = list()
+
                 for di in range(targets.size(1)):
                     input_var = targets[:, di].unsqueeze(1)
                     step_outputs, hidden_states, attn = self.forward_step(
@@ -182,23 +204,26 @@ class DecoderRNN(BaseDecoder):
                         hidden_states,
                         encoder_outputs,
                         attn,
+                        cached_kv,
                     )
                     predicted_log_probs.append(step_outputs)
 
+                predicted_log_probs = torch.stack(predicted_log_probs, dim=1)
+
             else:
-                step_outputs, hidden_states, attn = self.forward_step(
+                # forward_step already returns the whole (batch, seq_length, num_classes)
+                # sequence here, so slicing it apart and re-stacking would only copy it
+                predicted_log_probs, hidden_states, attn = self.forward_step(
                     input_var=targets,
                     hidden_states=hidden_states,
                     encoder_outputs=encoder_outputs,
                     attn=attn,
                 )
 
-                for di in range(step_outputs.size(1)):
-                    step_output = step_outputs[:, di, :]
-                    predicted_log_probs.append(step_output)
-
         else:
             input_var = targets[:, 0].unsqueeze(1)
+            cached_kv = self.precompute_attention_kv(encoder_outputs)
+            predicted_log_probs = encoder_outputs.new_empty(batch_size, max_length, self.num_classes)
 
             for di in range(max_length):
                 step_outputs, hidden_states, attn = self.forward_step(
@@ -206,11 +231,10 @@ class DecoderRNN(BaseDecoder):
                     hidden_states=hidden_states,
                     encoder_outputs=encoder_outputs,
                     attn=attn,
+                    cached_kv=cached_kv,
                 )
-                predicted_log_probs.append(step_outputs)
-                input_var = predicted_log_probs[-1].topk(1)[1]
-
-        predicted_log_probs = torch.stack(predicted_log_probs, dim=1)
+                predicted_log_probs[:, di] = step_outputs
+                input_var = step_outputs.topk(1)[1]
 
         return predicted_log_probs
 
@@ -227,14 +251,16 @@ class DecoderRNN(BaseDecoder):
         Returns:
             * predicted_log_probs (torch.FloatTensor): Log probability of model predictions.
         """
+        if self.use_cuda_graph and encoder_outputs.is_cuda and self.attn_mechanism != 'loc':
+            return self._decode_with_cuda_graph(encoder_outputs)
+
         hidden_states, attn = None, None
-        outputs = list()
 
         batch_size = encoder_outputs.size(0)
-        input_var = LongTensor([self.sos_id] * batch_size).view(batch_size, 1)
+        input_var = encoder_outputs.new_full((batch_size, 1), self.sos_id, dtype=torch.long)
+        outputs = encoder_outputs.new_empty((batch_size, self.max_length), dtype=torch.long)
 
-        if torch.cuda.is_available():
-            input_var = input_var.cuda()
+        cached_kv = self.precompute_attention_kv(encoder_outputs)
 
         for di in range(self.max_length):
             step_outputs, hidden_states, attn = self.forward_step(
@@ -242,11 +268,88 @@ class DecoderRNN(BaseDecoder):
                 hidden_states=hidden_states,
                 encoder_outputs=encoder_outputs,
                 attn=attn,
+                cached_kv=cached_kv,
             )
             input_var = step_outputs.topk(1)[1]
-            outputs.append(input_var)
+            outputs[:, di] = input_var.squeeze(1)
 
-        outputs = torch.stack(outputs, dim=1).squeeze(2)
+        return outputs
+
+    @torch.jit.ignore
+    @torch.no_grad()
+    def _decode_with_cuda_graph(self, encoder_outputs: Tensor) -> Tensor:
+        """
+        Greedy decoding with the per-step computation captured as a CUDA Graph.
+
+        The CUDA Graph / Stream capture APIs are not scriptable, so the method is ignored by
+        TorchScript; the `use_cuda_graph` guard in `decode` keeps scripted modules on the eager
+        loop at runtime.
+
+        Once the attention key/value cache is built, every decoding step launches the same kernel
+        sequence on identical shapes, so the step is captured once and replayed `max_length` times.
+        This removes the per-step kernel-launch overhead of the eager loop. Only used when
+        `use_cuda_graph` is set; location-aware attention is excluded because its alignment state
+        changes the captured graph's inputs.
+        """
+        batch_size = encoder_outputs.size(0)
+        outputs = encoder_outputs.new_empty((batch_size, self.max_length), dtype=torch.long)
+
+        cached_kv = self.precompute_attention_kv(encoder_outputs)
+        static_input = torch.full(
+            (batch_size, 1), self.sos_id, dtype=torch.long, device=encoder_outputs.device
+        )
+
+        # run the first step eagerly to materialize hidden states with stable shapes
+        step_outputs, hidden_states, _ = self.forward_step(
+            input_var=static_input,
+            hidden_states=None,
+            encoder_outputs=encoder_outputs,
+            cached_kv=cached_kv,
+        )
+        first_tokens = step_outputs.topk(1)[1]
+        outputs[:, 0] = first_tokens.squeeze(1)
+
+        if isinstance(hidden_states, tuple):
+            static_hidden = tuple(h.clone() for h in hidden_states)
+        else:
+            static_hidden = hidden_states.clone()
+        static_input.copy_(first_tokens)
+
+        # warm up on a side stream to stabilize allocations before capture
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream):
+            for _ in range(3):
+                self.forward_step(
+                    input_var=static_input,
+                    hidden_states=static_hidden,
+                    encoder_outputs=encoder_outputs,
+                    cached_kv=cached_kv,
+                )
+        torch.cuda.current_stream().wait_stream(stream)
+
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph):
+            graph_step_outputs, graph_hidden, _ = self.forward_step(
+                input_var=static_input,
+                hidden_states=static_hidden,
+                encoder_outputs=encoder_outputs,
+                cached_kv=cached_kv,
+            )
+            graph_tokens = graph_step_outputs.topk(1)[1]
+
+        for di in range(1, self.max_length):
+            graph.replay()
+
+            # feed the replayed step's outputs back into the graph's static inputs
+            static_input.copy_(graph_tokens)
+            if isinstance(static_hidden, tuple):
+                for static_h, graph_h in zip(static_hidden, graph_hidden):
+                    static_h.copy_(graph_h)
+            else:
+                static_hidden.copy_(graph_hidden)
+
+            outputs[:, di] = graph_tokens.squeeze(1)
 
         return outputs
 
@@ -261,12 +364,9 @@ class DecoderRNN(BaseDecoder):
         batch_size = encoder_outputs.size(0)
 
         if targets is None:  # inference
-            targets = LongTensor([self.sos_id] * batch_size).view(batch_size, 1)
+            targets = encoder_outputs.new_full((batch_size, 1), self.sos_id, dtype=torch.long)
             max_length = self.max_length
 
-            if torch.cuda.is_available():
-                targets = targets.cuda()
-
             if teacher_forcing_ratio > 0:
                 raise ValueError("Teacher forcing has to be disabled (set 0) when no targets is provided.")
 
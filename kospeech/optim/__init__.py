@@ -37,10 +37,18 @@ class Optimizer(object):
         self.max_grad_norm = max_grad_norm
         self.count = 0
 
-    def step(self, model):
+    def step(self, model, scaler=None):
+        if scaler is not None:
+            scaler.unscale_(self.optimizer)
+
         if self.max_grad_norm > 0:
             torch.nn.utils.clip_grad_norm_(model.parameters(), self.max_grad_norm)
-        self.optimizer.step()
+
+        if scaler is not None:
+            scaler.step(self.optimizer)
+            scaler.update()
+        else:
+            self.optimizer.step()
 
         if self.scheduler is not None:
             self.update()
@@ -32,6 +32,8 @@ class TrainConfig:
 
     num_workers: int = 4
     use_cuda: bool = True
+    mixed_precision: bool = False
+    torch_compile: bool = False
     num_threads: int = 2
 
     init_lr_scale: float = 0.01
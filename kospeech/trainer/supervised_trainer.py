@@ -12,13 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import csv
 import math
 import time
+import os
 import torch
+import torch.distributed as dist
 import torch.nn as nn
-import queue
-import pandas as pd
+from functools import partial
 from torch import Tensor
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data import ConcatDataset, DataLoader, DistributedSampler
 from typing import Tuple
 
 from kospeech.optim import Optimizer
@@ -30,11 +34,8 @@ from kospeech.criterion import (
     LabelSmoothedCrossEntropyLoss,
     JointCTCCrossEntropyLoss,
 )
-from kospeech.data import (
-    MultiDataLoader,
-    AudioDataLoader,
-    SpectrogramDataset,
-)
+from kospeech.data import SpectrogramDataset
+from kospeech.data.data_loader import _collate_fn
 
 
 class SupervisedTrainer(object):
@@ -52,9 +53,6 @@ class SupervisedTrainer(object):
         save_result_every (int): number of timesteps to save result after
         checkpoint_every (int): number of timesteps to checkpoint after
     """
-    train_dict = {'loss': [], 'cer': []}
-    valid_dict = {'loss': [], 'cer': []}
-    train_step_result = {'loss': [], 'cer': []}
     TRAIN_RESULT_PATH = "train_result.csv"
     VALID_RESULT_PATH = "eval_result.csv"
     TRAIN_STEP_RESULT_PATH = "train_step_result.csv"
@@ -75,6 +73,7 @@ class SupervisedTrainer(object):
             architecture: str = 'las',                     # model to train - las, transformer
             vocab: Vocabulary = None,                      # vocabulary object
             joint_ctc_attention: bool = False,             # flag indication whether joint CTC-Attention or not
+            mixed_precision: bool = False,                 # flag indication whether to train with mixed precision
     ) -> None:
         self.num_workers = num_workers
         self.optimizer = optimizer
@@ -91,6 +90,11 @@ class SupervisedTrainer(object):
         self.architecture = architecture.lower()
         self.vocab = vocab
         self.joint_ctc_attention = joint_ctc_attention
+        self.use_amp = mixed_precision and torch.cuda.is_available()
+        self.scaler = torch.cuda.amp.GradScaler(enabled=self.use_amp)
+        self.distributed = dist.is_available() and dist.is_initialized()
+        # under DDP only rank 0 writes checkpoints & result files
+        self.is_master = not self.distributed or dist.get_rank() == 0
 
         if self.joint_ctc_attention:
             self.log_format = "step: {:4d}/{:4d}, loss: {:.6f}, ctc_loss: {:.6f}, ce_loss: {:.6f}, " \
@@ -130,6 +134,16 @@ class SupervisedTrainer(object):
             latest_checkpoint_path = checkpoint.get_latest_checkpoint()
             resume_checkpoint = checkpoint.load(latest_checkpoint_path)
             model = resume_checkpoint.model
+
+            if self.distributed:
+                # checkpoints store the unwrapped module; without re-wrapping, each rank
+                # would train its own shard with no gradient all-reduce and silently diverge
+                if isinstance(model, nn.DataParallel):
+                    model = model.module
+                model = DistributedDataParallel(
+                    model.to(self.device), device_ids=[torch.cuda.current_device()]
+                )
+
             self.optimizer = resume_checkpoint.optimizer
             self.trainset_list = resume_checkpoint.trainset_list
             self.validset = resume_checkpoint.validset
@@ -144,50 +158,66 @@ class SupervisedTrainer(object):
         logger.info('start')
         train_begin_time = time.time()
 
+        collate_fn = partial(_collate_fn, pad_id=self.vocab.pad_id)
+
+        # build the loaders once; persistent workers stay alive across epochs,
+        # so epoch boundaries do not pay worker startup & first-batch latency.
+        # shuffle=True reshuffles the sampler on every epoch by itself.
+        trainset = ConcatDataset(self.trainset_list)
+        train_sampler = DistributedSampler(trainset) if self.distributed else None
+        train_loader = DataLoader(
+            trainset,
+            batch_size=batch_size,
+            shuffle=train_sampler is None,
+            sampler=train_sampler,
+            num_workers=self.num_workers,
+            collate_fn=collate_fn,
+            pin_memory=True,
+            persistent_workers=self.num_workers > 0,
+        )
+        valid_loader = DataLoader(
+            self.validset,
+            batch_size=batch_size,
+            shuffle=False,
+            num_workers=self.num_workers,
+            collate_fn=collate_fn,
+            pin_memory=True,
+            persistent_workers=self.num_workers > 0,
+        )
+
         for epoch in range(start_epoch, num_epochs):
             logger.info('Epoch %d start' % epoch)
-            train_queue = queue.Queue(self.num_workers << 1)
-
-            for trainset in self.trainset_list:
-                trainset.shuffle()
 
-            # Training
-            train_loader = MultiDataLoader(
-                self.trainset_list, train_queue, batch_size, self.num_workers, self.vocab.pad_id
-            )
-            train_loader.start()
+            if train_sampler is not None:
+                train_sampler.set_epoch(epoch)
 
             model, train_loss, train_cer = self._train_epoches(
                 model=model,
                 epoch=epoch,
                 epoch_time_step=epoch_time_step,
                 train_begin_time=train_begin_time,
-                queue=train_queue,
+                train_loader=train_loader,
                 teacher_forcing_ratio=teacher_forcing_ratio,
             )
-            train_loader.join()
 
-            Checkpoint(model, self.optimizer, self.trainset_list, self.validset, epoch).save()
+            if self.is_master:
+                Checkpoint(model, self.optimizer, self.trainset_list, self.validset, epoch).save()
             logger.info('Epoch %d (Training) Loss %0.4f CER %0.4f' % (epoch, train_loss, train_cer))
 
             teacher_forcing_ratio -= self.teacher_forcing_step
             teacher_forcing_ratio = max(self.min_teacher_forcing_ratio, teacher_forcing_ratio)
 
-            # Validation
-            valid_queue = queue.Queue(self.num_workers << 1)
-            valid_loader = AudioDataLoader(self.validset, valid_queue, batch_size, 0, self.vocab.pad_id)
-            valid_loader.start()
-
-            valid_cer = self._validate(model, valid_queue)
-            valid_loader.join()
+            valid_cer = self._validate(model, valid_loader)
 
             logger.info('Epoch %d CER %0.4f' % (epoch, valid_cer))
-            self._save_epoch_result(train_result=[self.train_dict, train_loss, train_cer],
-                                     valid_result=[self.valid_dict, train_loss, valid_cer])
-            logger.info('Epoch %d Training result saved as a csv file complete !!' % epoch)
+            if self.is_master:
+                self._save_epoch_result(train_result=[train_loss, train_cer],
+                                         valid_result=[train_loss, valid_cer])
+                logger.info('Epoch %d Training result saved as a csv file complete !!' % epoch)
             torch.cuda.empty_cache()
 
-        Checkpoint(model, self.optimizer, self.trainset_list, self.validset, num_epochs).save()
+        if self.is_master:
+            Checkpoint(model, self.optimizer, self.trainset_list, self.validset, num_epochs).save()
         return model
 
     def _train_epoches(
@@ -196,7 +226,7 @@ class SupervisedTrainer(object):
             epoch: int,
             epoch_time_step: int,
             train_begin_time: float,
-            queue: queue.Queue,
+            train_loader: DataLoader,
             teacher_forcing_ratio: float,
     ) -> Tuple[nn.Module, float, float]:
         """
@@ -207,7 +237,7 @@ class SupervisedTrainer(object):
             epoch (int): number of current epoch
             epoch_time_step (int): total time step in one epoch
             train_begin_time (float): time of train begin
-            queue (queue.Queue): training queue, containing input, targets, input_lengths, target_lengths
+            train_loader (torch.utils.data.DataLoader): loader yielding input, targets, input_lengths, target_lengths
             teacher_forcing_ratio (float): teaching forcing ratio (default 0.99)
 
         Returns: loss, cer
@@ -216,7 +246,7 @@ class SupervisedTrainer(object):
         """
         architecture = self.architecture
         if self.architecture == 'conformer':
-            if isinstance(model, nn.DataParallel):
+            if isinstance(model, (nn.DataParallel, DistributedDataParallel)):
                 architecture = 'conformer_t' if model.module.decoder is not None else 'conformer_ctc'
             else:
                 architecture = 'conformer_t' if model.decoder is not None else 'conformer_ctc'
@@ -229,45 +259,41 @@ class SupervisedTrainer(object):
         model.train()
 
         begin_time = epoch_begin_time = time.time()
-        num_workers = self.num_workers
-
-        while True:
-            inputs, targets, input_lengths, target_lengths = queue.get()
 
+        for inputs, targets, input_lengths, target_lengths in train_loader:
             if inputs.shape[0] == 0:
-                # Empty feats means closing one loader
-                num_workers -= 1
-                logger.debug('left train_loader: %d' % num_workers)
-
-                if num_workers == 0:
-                    break
-                else:
-                    continue
+                # every sample in the batch failed to parse
+                continue
 
             self.optimizer.zero_grad()
 
-            inputs = inputs.to(self.device)
-            targets = targets.to(self.device)
+            inputs = inputs.to(self.device, non_blocking=True)
+            targets = targets.to(self.device, non_blocking=True)
             input_lengths = input_lengths.to(self.device)
             target_lengths = torch.as_tensor(target_lengths).to(self.device)
 
             model = model.to(self.device)
-            output, loss, ctc_loss, cross_entropy_loss = self._model_forward(
-                teacher_forcing_ratio=teacher_forcing_ratio,
-                inputs=inputs,
-                input_lengths=input_lengths,
-                targets=targets,
-                target_lengths=target_lengths,
-                model=model,
-                architecture=architecture,
-            )
+            with torch.cuda.amp.autocast(enabled=self.use_amp):
+                output, loss, ctc_loss, cross_entropy_loss = self._model_forward(
+                    teacher_forcing_ratio=teacher_forcing_ratio,
+                    inputs=inputs,
+                    input_lengths=input_lengths,
+                    targets=targets,
+                    target_lengths=target_lengths,
+                    model=model,
+                    architecture=architecture,
+                )
 
             if architecture not in ('rnnt', 'conformer_t'):
                 y_hats = output.max(-1)[1]
                 cer = self.metric(targets[:, 1:], y_hats)
 
-            loss.backward()
-            self.optimizer.step(model)
+            if self.use_amp:
+                self.scaler.scale(loss).backward()
+                self.optimizer.step(model, scaler=self.scaler)
+            else:
+                loss.backward()
+                self.optimizer.step(model)
 
             total_num += int(input_lengths.sum())
             epoch_loss_total += loss.item()
@@ -303,26 +329,27 @@ class SupervisedTrainer(object):
                         ))
                 begin_time = time.time()
 
-            if timestep % self.save_result_every == 0:
-                self._save_step_result(self.train_step_result, epoch_loss_total / total_num, cer)
+            if timestep % self.save_result_every == 0 and self.is_master:
+                self._save_step_result(epoch_loss_total / total_num, cer)
 
-            if timestep % self.checkpoint_every == 0:
+            if timestep % self.checkpoint_every == 0 and self.is_master:
                 Checkpoint(model, self.optimizer,  self.trainset_list, self.validset, epoch).save()
 
             del inputs, input_lengths, targets, output, loss
 
-        Checkpoint(model, self.optimizer, self.trainset_list, self.validset, epoch).save()
+        if self.is_master:
+            Checkpoint(model, self.optimizer, self.trainset_list, self.validset, epoch).save()
         logger.info('train() completed')
 
         return model, epoch_loss_total / total_num, cer
 
-    def _validate(self, model: nn.Module, queue: queue.Queue) -> float:
+    def _validate(self, model: nn.Module, valid_loader: DataLoader) -> float:
         """
         Run training one epoch
 
         Args:
             model (torch.nn.Module): model to train
-            queue (queue.Queue): validation queue, containing input, targets, input_lengths, target_lengths
+            valid_loader (torch.utils.data.DataLoader): loader yielding input, targets, input_lengths, target_lengths
 
         Returns: loss, cer
             - **loss** (float): loss of validation
@@ -334,28 +361,28 @@ class SupervisedTrainer(object):
         model.eval()
         logger.info('validate() start')
 
-        while True:
-            inputs, targets, input_lengths, target_lengths = queue.get()
-
+        for inputs, targets, input_lengths, target_lengths in valid_loader:
             if inputs.shape[0] == 0:
-                break
+                continue
 
-            inputs = inputs.to(self.device)
+            inputs = inputs.to(self.device, non_blocking=True)
             targets = targets[:, 1:].to(self.device)
             model.to(self.device)
 
-            if isinstance(model, nn.DataParallel):
+            if isinstance(model, (nn.DataParallel, DistributedDataParallel)):
                 y_hats = model.module.recognize(inputs, input_lengths)
             else:
                 y_hats = model.recognize(inputs, input_lengths)
                 
-            for idx in range(targets.size(0)):
-                target_list.append(self.vocab.label_to_string(targets[idx]))
-                predict_list.append(self.vocab.label_to_string(y_hats[idx].cpu().detach().numpy()))
-                
+            # decode the whole batch at once instead of sample by sample
+            target_list.extend(self.vocab.label_to_string(targets))
+            predict_list.extend(self.vocab.label_to_string(y_hats))
+
+
             cer = self.metric(targets[:, 1:], y_hats)
 
-        self._save_result(target_list, predict_list)
+        if self.is_master:
+            self._save_result(target_list, predict_list)
         logger.info('validate() completed')
 
         return cer
@@ -374,7 +401,7 @@ class SupervisedTrainer(object):
         cross_entropy_loss = None
 
         if architecture == 'las':
-            if isinstance(model, nn.DataParallel):
+            if isinstance(model, (nn.DataParallel, DistributedDataParallel)):
                 model.module.flatten_parameters()
             else:
                 model.flatten_parameters()
@@ -443,37 +470,32 @@ class SupervisedTrainer(object):
         return outputs, loss, ctc_loss, cross_entropy_loss
 
     def _save_result(self, target_list: list, predict_list: list) -> None:
-        results = {
-            'targets': target_list,
-            'predictions': predict_list
-        }
         date_time = time.strftime('%Y_%m_%d_%H_%M_%S', time.localtime())
         save_path = f"{date_time}-valid.csv"
-        
-        results = pd.DataFrame(results)
-        results.to_csv(save_path, index=False, encoding='cp949')
 
-    def _save_epoch_result(self, train_result: list, valid_result: list) -> None:
-        """ Save result of epoch """
-        train_dict, train_loss, train_cer = train_result
-        valid_dict, valid_loss, valid_cer = valid_result
+        with open(save_path, 'w', newline='', encoding='cp949') as f:
+            writer = csv.writer(f)
+            writer.writerow(['targets', 'predictions'])
+            writer.writerows(zip(target_list, predict_list))
 
-        train_dict["loss"].append(train_loss)
-        valid_dict["loss"].append(valid_loss)
+    def _append_result_row(self, save_path: str, loss: float, cer: float) -> None:
+        """ Append a single result row to a csv file, writing the header on first use """
+        write_header = not os.path.isfile(save_path)
 
-        train_dict["cer"].append(train_cer)
-        valid_dict["cer"].append(valid_cer)
+        with open(save_path, 'a', newline='', encoding='cp949') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(['loss', 'cer'])
+            writer.writerow([loss, cer])
 
-        train_df = pd.DataFrame(train_dict)
-        valid_df = pd.DataFrame(valid_dict)
+    def _save_epoch_result(self, train_result: list, valid_result: list) -> None:
+        """ Save result of epoch """
+        train_loss, train_cer = train_result
+        valid_loss, valid_cer = valid_result
 
-        train_df.to_csv(SupervisedTrainer.TRAIN_RESULT_PATH, encoding="cp949", index=False)
-        valid_df.to_csv(SupervisedTrainer.VALID_RESULT_PATH, encoding="cp949", index=False)
+        self._append_result_row(SupervisedTrainer.TRAIN_RESULT_PATH, train_loss, train_cer)
+        self._append_result_row(SupervisedTrainer.VALID_RESULT_PATH, valid_loss, valid_cer)
 
-    def _save_step_result(self, train_step_result: dict, loss: float, cer: float) -> None:
+    def _save_step_result(self, loss: float, cer: float) -> None:
         """ Save result of --save_result_every step """
-        train_step_result["loss"].append(loss)
-        train_step_result["cer"].append(cer)
-
-        train_step_df = pd.DataFrame(train_step_result)
-        train_step_df.to_csv(SupervisedTrainer.TRAIN_STEP_RESULT_PATH, encoding="cp949", index=False)
+        self._append_result_row(SupervisedTrainer.TRAIN_STEP_RESULT_PATH, loss, cer)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import torch
 import torch.nn as nn
 import logging
@@ -48,6 +49,15 @@ def check_envirionment(use_cuda: bool) -> torch.device:
     cuda = use_cuda and torch.cuda.is_available()
     device = torch.device('cuda' if cuda else 'cpu')
 
+    if cuda:
+        # serializing every kernel launch is debug-only behaviour: it kills all
+        # host/device overlap, so require an explicit opt-in
+        if os.environ.get('DEBUG_CUDA'):
+            os.environ['CUDA_LAUNCH_BLOCKING'] = '1'
+
+        # let cuDNN autotune conv/RNN algorithms for the shapes actually seen
+        torch.backends.cudnn.benchmark = True
+
     logger.info(f"Operating System : {platform.system()} {platform.release()}")
     logger.info(f"Processor : {platform.processor()}")
 
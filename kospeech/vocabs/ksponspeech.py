@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import csv
+import numpy as np
 from kospeech.vocabs import Vocabulary
 
 
@@ -35,6 +36,11 @@ class KsponSpeechVocabulary(Vocabulary):
             self.pad_id = int(self.vocab_dict['<pad>'])
             self.blank_id = int(self.vocab_dict['<blank>'])
             self.labels = self.vocab_dict.keys()
+            # lookup table for vectorized decoding; sized by the largest id so that
+            # gaps in the csv's id column cannot break construction
+            self.id2unit_array = np.full(max(self.id_dict) + 1, '', dtype=object)
+            for idx, unit in self.id_dict.items():
+                self.id2unit_array[idx] = unit
 
         self.vocab_path = vocab_path
         self.output_unit = output_unit
@@ -59,40 +65,35 @@ class KsponSpeechVocabulary(Vocabulary):
         Returns: sentence
             - **sentence** (str or list): symbol of labels
         """
+        if hasattr(labels, 'cpu'):
+            labels = labels.cpu()
+        labels = np.asarray(labels)
+
         if self.output_unit == 'subword':
             if len(labels.shape) == 1:
                 return self.sp.DecodeIds([int(l) for l in labels])
 
             sentences = list()
             for batch in labels:
-                sentence = str()
-                for label in batch:
-                    sentence = self.sp.DecodeIds([int(l) for l in label])
-                sentences.append(sentence)
+                sentences.append(self.sp.DecodeIds([int(l) for l in batch]))
             return sentences
 
         if len(labels.shape) == 1:
-            sentence = str()
-            for label in labels:
-                if label.item() == self.eos_id:
-                    break
-                elif label.item() == self.blank_id:
-                  continue
-                sentence += self.id_dict[label.item()]
-            return sentence
+            return self._units_to_sentence(labels)
 
         sentences = list()
         for batch in labels:
-            sentence = str()
-            for label in batch:
-                if label.item() == self.eos_id:
-                    break
-                elif label.item() == self.blank_id:
-                  continue
-                sentence += self.id_dict[label.item()]
-            sentences.append(sentence)
+            sentences.append(self._units_to_sentence(batch))
         return sentences
 
+    def _units_to_sentence(self, labels: np.ndarray) -> str:
+        """ Converts a single label sequence with a vectorized lookup instead of a per-token dict access """
+        eos_positions = np.flatnonzero(labels == self.eos_id)
+        if eos_positions.size > 0:
+            labels = labels[:eos_positions[0]]
+        labels = labels[labels != self.blank_id]
+        return ''.join(self.id2unit_array[labels])
+
     def load_vocab(self, label_path, encoding='utf-8'):
         """
         Provides char2id, id2char
@@ -118,7 +119,7 @@ class KsponSpeechVocabulary(Vocabulary):
                     id2unit[int(row[0])] = row[1]
 
                 unit2id['<blank>'] = len(unit2id)
-                id2unit[len(unit2id)] = '<blank>'
+                id2unit[unit2id['<blank>']] = '<blank>'
 
             return unit2id, id2unit
         except IOError:
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
 from kospeech.vocabs import Vocabulary
 
 
@@ -40,13 +42,14 @@ class LibriSpeechVocabulary(Vocabulary):
         return count
 
     def label_to_string(self, labels):
+        if hasattr(labels, 'cpu'):
+            labels = labels.cpu()
+        labels = np.asarray(labels)
+
         if len(labels.shape) == 1:
-            return self.sp.DecodeIds([l for l in labels])
+            return self.sp.DecodeIds([int(l) for l in labels])
 
         sentences = list()
         for batch in labels:
-            sentence = str()
-            for label in batch:
-                sentence = self.sp.DecodeIds([l for l in label])
-            sentences.append(sentence)
+            sentences.append(self.sp.DecodeIds([int(l) for l in batch]))
         return sentences
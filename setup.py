@@ -23,7 +23,7 @@ setup(
     url='https://github.com/sooftware/KoSpeech',
     install_requires=[
         'torch>=1.4.0',
-        'python-Levenshtein',
+        'rapidfuzz',
         'librosa >= 0.7.0',
         'numpy',
         'pandas',
@@ -0,0 +1,39 @@
+# Copyright (c) 2020, Soohwan Kim. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import torch
+
+from kospeech.vocabs.ksponspeech import KsponSpeechVocabulary
+
+VOCAB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'vocab', 'aihub_character_vocabs.csv')
+
+vocab = KsponSpeechVocabulary(VOCAB_PATH)
+assert vocab.id2unit_array[vocab.blank_id] == '<blank>'
+print("vocab construction PASS")
+
+targets = torch.LongTensor([
+    [5, 3, 6, vocab.eos_id, vocab.pad_id],
+    [6, vocab.blank_id, 5, 4, vocab.eos_id],
+    [4, 3, 5, 6, vocab.pad_id],
+])
+
+sentences = vocab.label_to_string(targets)
+assert isinstance(sentences, list) and len(sentences) == len(targets)
+assert vocab.id2unit_array[vocab.blank_id] not in sentences[1]
+print("batch label_to_string PASS")
+
+for target, sentence in zip(targets, sentences):
+    assert vocab.label_to_string(target) == sentence
+print("single label_to_string PASS")